@@ -4,6 +4,7 @@ import (
 	"context"
 	"encoding/json"
 	"fmt"
+	"io/fs"
 	"log"
 	"mime"
 	"net/http"
@@ -13,6 +14,7 @@ import (
 	"sort"
 	"strconv"
 	"strings"
+	"sync"
 	"time"
 	"wechatDataBackup/pkg/utils"
 	"wechatDataBackup/pkg/wechat"
@@ -27,6 +29,10 @@ const (
 	configUsersKey       = "userConfig.users"
 	configExportPathKey  = "exportPath"
 	appVersion           = "v1.2.4"
+	backupWorkerNumber   = 3
+	hashWorkerNumber     = 4
+	backupLogBatchSize   = 100
+	emptyFileHash        = "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
 )
 
 type FileLoader struct {
@@ -153,6 +159,16 @@ type ErrorMessage struct {
 	ErrorStr string `json:"error"`
 }
 
+// 备份MsgAttach图片时认可的扩展名
+var backupImageExts = map[string]bool{
+	".jpg":  true,
+	".jpeg": true,
+	".png":  true,
+	".gif":  true,
+	".bmp":  true,
+	".tif":  true,
+}
+
 // 增量备份配置
 type IncrementalBackupConfig struct {
 	EnableBackup    bool   `json:"enableBackup"`
@@ -163,12 +179,13 @@ type IncrementalBackupConfig struct {
 
 // 新增数据记录
 type NewDataRecord struct {
-	FilePath    string `json:"filePath"`
-	FileSize    int64  `json:"fileSize"`
-	ModifyTime  int64  `json:"modifyTime"`
-	FileHash    string `json:"fileHash"`
-	DataType    string `json:"dataType"` // "database", "image", "video", "voice", etc.
-	BackupPath  string `json:"backupPath"`
+	FilePath     string `json:"filePath"`
+	FileSize     int64  `json:"fileSize"`
+	ModifyTime   int64  `json:"modifyTime"`
+	ModifyTimeNs int64  `json:"modifyTimeNs"` // 纳秒精度的修改时间，用于判断能否沿用历史哈希
+	FileHash     string `json:"fileHash"`
+	DataType     string `json:"dataType"` // "database", "image", "video", "voice", etc.
+	BackupPath   string `json:"backupPath"`
 }
 
 // 增量备份结果
@@ -179,6 +196,10 @@ type IncrementalBackupResult struct {
 	BackupSize     int64           `json:"backupSize"`
 	BackupPath     string          `json:"backupPath"`
 	NewDataRecords []NewDataRecord `json:"newDataRecords"`
+	// 扫描时读取的备份历史，备份完成后写回
+	history map[string]NewDataRecord
+	// 用户配置的备份根目录，BackupPath是其下本次备份的子目录
+	backupRoot string
 }
 
 // 新消息导出配置
@@ -1105,44 +1126,60 @@ func (a *App) scanExistingFiles(expPath, backupPath string) *IncrementalBackupRe
 	backupDir := fmt.Sprintf("%s\\%s\\%d", backupPath, a.defaultUser, time.Now().Unix())
 	os.MkdirAll(backupDir, os.ModePerm)
 	result.BackupPath = backupDir
+	result.backupRoot = backupPath
+
+	result.history = a.loadBackupHistory()
 
 	// 扫描Msg目录（数据库文件）
 	msgPath := expPath + "\\Msg"
 	if _, err := os.Stat(msgPath); err == nil {
-		a.scanDirectoryForBackup(msgPath, backupDir, "database", result)
+		a.scanDirectoryForBackup(msgPath, backupDir, "database", result.history, result)
 	}
 
 	// 扫描FileStorage目录（媒体文件）
 	fileStoragePath := expPath + "\\FileStorage"
 	if _, err := os.Stat(fileStoragePath); err == nil {
-		a.scanDirectoryForBackup(fileStoragePath, backupDir, "media", result)
+		a.scanDirectoryForBackup(fileStoragePath, backupDir, "media", result.history, result)
 	}
 
 	return result
 }
 
 // 扫描目录并记录文件信息
-func (a *App) scanDirectoryForBackup(srcPath, backupDir, dataType string, result *IncrementalBackupResult) {
-	err := filepath.Walk(srcPath, func(path string, info os.FileInfo, err error) error {
+func (a *App) scanDirectoryForBackup(srcPath, backupDir, dataType string, history map[string]NewDataRecord, result *IncrementalBackupResult) {
+	records := make([]NewDataRecord, 0)
+	err := filepath.WalkDir(srcPath, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return err
 		}
 
-		if !info.IsDir() {
+		if !d.IsDir() {
+			info, err := d.Info()
+			if err != nil {
+				return err
+			}
 			record := NewDataRecord{
-				FilePath:   path,
-				FileSize:   info.Size(),
-				ModifyTime: info.ModTime().Unix(),
-				DataType:   dataType,
+				FilePath:     path,
+				FileSize:     info.Size(),
+				ModifyTime:   info.ModTime().Unix(),
+				ModifyTimeNs: info.ModTime().UnixNano(),
+				DataType:     dataType,
 			}
-			
-			// 计算文件哈希
-			if hash, err := utils.CalculateFileHash(path); err == nil {
-				record.FileHash = hash
+
+			// 空文件的哈希是固定值，无需打开文件
+			if record.FileSize == 0 {
+				record.FileHash = emptyFileHash
 			}
-			
-			result.NewDataRecords = append(result.NewDataRecords, record)
-			result.TotalFiles++
+
+			// 大小和纳秒级修改时间与上次备份一致时沿用记录的哈希，无需重新读取文件；
+			// 没有纳秒时间的旧记录一律重新计算
+			if existing, ok := history[path]; ok &&
+				existing.ModifyTimeNs != 0 &&
+				existing.FileSize == record.FileSize &&
+				existing.ModifyTimeNs == record.ModifyTimeNs {
+				record.FileHash = existing.FileHash
+			}
+			records = append(records, record)
 		}
 		return nil
 	})
@@ -1150,81 +1187,199 @@ func (a *App) scanDirectoryForBackup(srcPath, backupDir, dataType string, result
 	if err != nil {
 		log.Printf("Error scanning directory %s: %v", srcPath, err)
 	}
+
+	// 并发计算文件哈希，使磁盘读取与哈希计算重叠
+	var wg sync.WaitGroup
+	indexChan := make(chan int, 100)
+	go func() {
+		for i := range records {
+			indexChan <- i
+		}
+		close(indexChan)
+	}()
+
+	for i := 0; i < hashWorkerNumber; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for index := range indexChan {
+				if records[index].FileHash != "" {
+					continue
+				}
+				if hash, err := utils.CalculateFileHash(records[index].FilePath); err == nil {
+					records[index].FileHash = hash
+				}
+			}
+		}()
+	}
+	wg.Wait()
+
+	result.NewDataRecords = append(result.NewDataRecords, records...)
+	result.TotalFiles += len(records)
 }
 
 // 备份新增数据
 func (a *App) backupNewData(expPath string, backupResult *IncrementalBackupResult) *IncrementalBackupResult {
 	log.Println("Starting incremental backup...")
-	
-	for i := range backupResult.NewDataRecords {
-		record := &backupResult.NewDataRecords[i]
-		
-		// 检查文件是否为新文件或已修改
-		if info, err := os.Stat(record.FilePath); err == nil {
-			// 检查文件是否已存在且未修改
-			existingRecord := a.findExistingRecord(record.FilePath)
-			if existingRecord != nil && 
-			   existingRecord.FileHash == record.FileHash && 
-			   existingRecord.FileSize == record.FileSize {
-				continue // 文件未变化，跳过备份
-			}
-			
-			// 更新文件信息
-			record.FileSize = info.Size()
-			record.ModifyTime = info.ModTime().Unix()
-			
-			// 计算相对路径
-			relPath, err := filepath.Rel(expPath, record.FilePath)
-			if err != nil {
-				log.Printf("Error calculating relative path: %v", err)
-				continue
-			}
-			
-			// 确定备份目标路径
-			backupFilePath := filepath.Join(backupResult.BackupPath, relPath)
-			backupDir := filepath.Dir(backupFilePath)
-			
-			// 创建备份目录
-			if err := os.MkdirAll(backupDir, os.ModePerm); err != nil {
-				log.Printf("Error creating backup directory: %v", err)
-				continue
-			}
-			
-			// 复制文件到备份目录
-			if _, err := utils.CopyFile(record.FilePath, backupFilePath); err == nil {
-				record.BackupPath = backupFilePath
-				backupResult.BackupFiles++
-				backupResult.BackupSize += record.FileSize
-				log.Printf("Backed up: %s -> %s", record.FilePath, backupFilePath)
-			} else {
-				log.Printf("Error backing up file %s: %v", record.FilePath, err)
-			}
+
+	history := backupResult.history
+	if history == nil {
+		history = a.loadBackupHistory()
+	}
+
+	var wg sync.WaitGroup
+	var resultMtx sync.Mutex
+	backupRecords := make([]NewDataRecord, 0)
+	// 成功备份的文件按批写入日志，由resultMtx保护
+	backupList := &backupLogBatch{title: "Backed up"}
+	recordChan := make(chan *NewDataRecord, 100)
+	go func() {
+		for i := range backupResult.NewDataRecords {
+			recordChan <- &backupResult.NewDataRecords[i]
 		}
+		close(recordChan)
+	}()
+
+	for i := 0; i < backupWorkerNumber; i++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for record := range recordChan {
+				if historyRecord, ok := a.backupDataRecord(expPath, backupResult.backupRoot, backupResult.BackupPath, history, record); ok {
+					resultMtx.Lock()
+					backupResult.BackupFiles++
+					backupResult.BackupSize += record.FileSize
+					backupRecords = append(backupRecords, historyRecord)
+					backupList.add(record.FilePath, record.BackupPath)
+					resultMtx.Unlock()
+				}
+			}
+		}()
 	}
-	
+	wg.Wait()
+
+	// 记录本次成功备份的文件，供下次增量备份比对
+	for _, record := range backupRecords {
+		history[record.FilePath] = record
+	}
+	a.saveBackupHistory(history)
+
+	backupList.flush()
 	backupResult.NewFiles = backupResult.BackupFiles
-	log.Printf("Incremental backup completed: %d files backed up, %d bytes", 
+	log.Printf("Incremental backup completed: %d files backed up, %d bytes",
 		backupResult.BackupFiles, backupResult.BackupSize)
-	
+
 	return backupResult
 }
 
-// 查找现有记录
-func (a *App) findExistingRecord(filePath string) *NewDataRecord {
-	// 这里可以从配置文件或数据库中查找现有记录
-	// 简化实现：从配置文件中读取
+// 备份单个新增数据文件，返回要写入备份历史的记录以及是否完成了复制。
+// 历史记录保留扫描时的大小、修改时间和哈希，三者描述的是同一版本的文件；
+// 导出过程中被改写的文件下次扫描时修改时间不同，会重新计算哈希。
+func (a *App) backupDataRecord(expPath, backupRoot, backupPath string, history map[string]NewDataRecord, record *NewDataRecord) (NewDataRecord, bool) {
+	historyRecord := *record
+
+	// 检查文件是否为新文件或已修改
+	info, err := os.Stat(record.FilePath)
+	if err != nil {
+		return historyRecord, false
+	}
+
+	// 检查文件是否已存在且未修改，并且上次的备份副本仍在当前备份根目录下
+	existingRecord, ok := history[record.FilePath]
+	if ok &&
+		existingRecord.FileHash == record.FileHash &&
+		existingRecord.FileSize == record.FileSize &&
+		backupCopyExists(backupRoot, existingRecord.BackupPath) {
+		return historyRecord, false // 文件未变化，跳过备份
+	}
+
+	// 更新文件信息
+	record.FileSize = info.Size()
+	record.ModifyTime = info.ModTime().Unix()
+	record.ModifyTimeNs = info.ModTime().UnixNano()
+
+	// 计算相对路径
+	relPath, err := filepath.Rel(expPath, record.FilePath)
+	if err != nil {
+		log.Printf("Error calculating relative path: %v", err)
+		return historyRecord, false
+	}
+
+	// 确定备份目标路径
+	backupFilePath := filepath.Join(backupPath, relPath)
+	backupDir := filepath.Dir(backupFilePath)
+
+	// 创建备份目录
+	if err := os.MkdirAll(backupDir, os.ModePerm); err != nil {
+		log.Printf("Error creating backup directory: %v", err)
+		return historyRecord, false
+	}
+
+	// 复制文件到备份目录
+	if _, err := utils.CopyFile(record.FilePath, backupFilePath); err != nil {
+		log.Printf("Error backing up file %s: %v", record.FilePath, err)
+		return historyRecord, false
+	}
+
+	record.BackupPath = backupFilePath
+	historyRecord.BackupPath = backupFilePath
+	return historyRecord, true
+}
+
+// 检查备份副本是否存在且位于备份根目录下
+func backupCopyExists(backupRoot, backupFilePath string) bool {
+	if backupRoot == "" || backupFilePath == "" {
+		return false
+	}
+	relPath, err := filepath.Rel(backupRoot, backupFilePath)
+	if err != nil || relPath == ".." || strings.HasPrefix(relPath, ".."+string(filepath.Separator)) {
+		return false
+	}
+	_, err = os.Stat(backupFilePath)
+	return err == nil
+}
+
+// 读取备份历史记录，按文件路径索引
+func (a *App) loadBackupHistory() map[string]NewDataRecord {
+	history := make(map[string]NewDataRecord)
 	configPath := fmt.Sprintf("%s\\backup_history.json", a.FLoader.FilePrefix)
 	if data, err := os.ReadFile(configPath); err == nil {
 		var records []NewDataRecord
 		if err := json.Unmarshal(data, &records); err == nil {
 			for i := range records {
-				if records[i].FilePath == filePath {
-					return &records[i]
-				}
+				history[records[i].FilePath] = records[i]
 			}
 		}
 	}
-	return nil
+	return history
+}
+
+// 保存备份历史记录，先写临时文件再替换，避免中断时留下不完整的记录
+func (a *App) saveBackupHistory(history map[string]NewDataRecord) {
+	records := make([]NewDataRecord, 0, len(history))
+	for _, record := range history {
+		records = append(records, record)
+	}
+	sort.Slice(records, func(i, j int) bool {
+		return records[i].FilePath < records[j].FilePath
+	})
+
+	historyJson, err := json.MarshalIndent(records, "", "  ")
+	if err != nil {
+		log.Printf("Error marshaling backup history: %v", err)
+		return
+	}
+
+	configPath := fmt.Sprintf("%s\\backup_history.json", a.FLoader.FilePrefix)
+	tmpPath := configPath + ".tmp"
+	if err := os.WriteFile(tmpPath, historyJson, os.ModePerm); err != nil {
+		log.Printf("Error writing backup history: %v", err)
+		return
+	}
+	if err := os.Rename(tmpPath, configPath); err != nil {
+		log.Printf("Error replacing backup history: %v", err)
+		os.Remove(tmpPath)
+	}
 }
 
 // 设置增量备份配置
@@ -2020,6 +2175,30 @@ func (a *App) backupMediaFile(sourcePath, userBackupPath, mediaType string, star
 	return backupFilePath
 }
 
+// 已备份文件的日志批次，每满backupLogBatchSize条写出一次，
+// 避免单条日志超过lumberjack的MaxSize而被整条丢弃
+type backupLogBatch struct {
+	title string
+	count int
+	list  strings.Builder
+}
+
+func (b *backupLogBatch) add(src, dst string) {
+	fmt.Fprintf(&b.list, "\n  %s -> %s", src, dst)
+	b.count++
+	if b.count%backupLogBatchSize == 0 {
+		b.flush()
+	}
+}
+
+func (b *backupLogBatch) flush() {
+	if b.list.Len() == 0 {
+		return
+	}
+	log.Printf("%s [%d]:%s", b.title, b.count, b.list.String())
+	b.list.Reset()
+}
+
 // 备份FileStorage目录中指定时间之后的新数据
 func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime int64) int {
 	fileStoragePath := expPath + "\\FileStorage"
@@ -2029,18 +2208,20 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 	}
 	
 	backupCount := 0
+	// 成功备份的文件按批写入日志
+	backupList := &backupLogBatch{title: "成功备份新文件"}
 	startTimeObj := time.Unix(startTime, 0)
 	
 	log.Printf("开始扫描FileStorage目录: %s，查找 %s 之后的新文件", fileStoragePath, startTimeObj.Format("2006-01-02 15:04:05"))
 	
-	err := filepath.Walk(fileStoragePath, func(path string, info os.FileInfo, err error) error {
+	err := filepath.WalkDir(fileStoragePath, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			log.Printf("访问文件时出错: %s, %v", path, err)
 			return nil // 继续处理其他文件
 		}
 		
 		// 跳过目录
-		if info.IsDir() {
+		if d.IsDir() {
 			return nil
 		}
 		
@@ -2069,6 +2250,11 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 					path, pathDate.Format("2006-01-02"), startTimeObj.Format("2006-01-02"), shouldBackup)
 			} else {
 				// 如果解析失败，使用文件修改时间
+				info, err := d.Info()
+				if err != nil {
+					log.Printf("获取文件信息失败: %s, %v", path, err)
+					return nil
+				}
 				fileModTime := info.ModTime()
 				shouldBackup = fileModTime.After(startTimeObj)
 				log.Printf("路径日期解析失败，使用修改时间: %s, 修改时间: %s, 开始时间: %s, 是否晚于: %v", 
@@ -2076,6 +2262,11 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 			}
 		} else {
 			// 如果路径中没有日期，使用文件修改时间
+			info, err := d.Info()
+			if err != nil {
+				log.Printf("获取文件信息失败: %s, %v", path, err)
+				return nil
+			}
 			fileModTime := info.ModTime()
 			shouldBackup = fileModTime.After(startTimeObj)
 			log.Printf("路径中无日期，使用修改时间: %s, 修改时间: %s, 开始时间: %s, 是否晚于: %v", 
@@ -2086,17 +2277,7 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 			// 特殊处理：如果是MsgAttach目录中的图片文件，需要检查是否是解码后的文件
 			if strings.Contains(path, "\\MsgAttach\\") && strings.Contains(path, "\\Image\\") {
 				// 检查是否是常见图片格式
-				ext := strings.ToLower(filepath.Ext(path))
-				imageExts := []string{".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tif"}
-				isImageFile := false
-				for _, imgExt := range imageExts {
-					if ext == imgExt {
-						isImageFile = true
-						break
-					}
-				}
-				
-				if !isImageFile {
+				if !backupImageExts[strings.ToLower(filepath.Ext(d.Name()))] {
 					// 不是图片文件，跳过
 					return nil
 				}
@@ -2132,7 +2313,7 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 			}
 			
 			backupCount++
-			log.Printf("成功备份新文件: %s -> %s", path, backupFilePath)
+			backupList.add(path, backupFilePath)
 		}
 		
 		return nil
@@ -2142,6 +2323,7 @@ func (a *App) backupFileStorageNewData(expPath, userBackupPath string, startTime
 		log.Printf("扫描FileStorage目录时出错: %v", err)
 	}
 	
+	backupList.flush()
 	log.Printf("FileStorage新数据备份完成，共备份 %d 个文件", backupCount)
 	return backupCount
 }
@@ -2151,13 +2333,13 @@ func (a *App) scanJSONFilesForReferencedPaths(savePath string) map[string]bool {
 	referencedFiles := make(map[string]bool)
 	
 	// 扫描save目录下的所有JSON文件
-	err := filepath.Walk(savePath, func(path string, info os.FileInfo, err error) error {
+	err := filepath.WalkDir(savePath, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return nil
 		}
 		
 		// 只处理JSON文件
-		if !strings.HasSuffix(strings.ToLower(path), ".json") {
+		if d.IsDir() || !strings.EqualFold(filepath.Ext(d.Name()), ".json") {
 			return nil
 		}
 		
@@ -2233,6 +2415,8 @@ func (a *App) extractFilePathsFromText(text string) []string {
 // 备份JSON文件中引用的文件
 func (a *App) backupReferencedFiles(expPath, userBackupPath string, referencedFiles map[string]bool) int {
 	backupCount := 0
+	// 成功备份的文件按批写入日志
+	backupList := &backupLogBatch{title: "成功备份引用文件"}
 	
 	for filePath := range referencedFiles {
 		// 构建完整的源文件路径
@@ -2267,20 +2451,22 @@ func (a *App) backupReferencedFiles(expPath, userBackupPath string, referencedFi
 		}
 		
 		backupCount++
-		log.Printf("成功备份引用文件: %s -> %s", sourcePath, backupFilePath)
+		backupList.add(sourcePath, backupFilePath)
 	}
 	
+	backupList.flush()
+	log.Printf("引用文件备份完成，共备份 %d 个文件", backupCount)
 	return backupCount
 }
 
 // 统计备份目录中的文件数量
 func (a *App) countBackupFiles(backupPath string) int {
 	count := 0
-	err := filepath.Walk(backupPath, func(path string, info os.FileInfo, err error) error {
+	err := filepath.WalkDir(backupPath, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return err
 		}
-		if !info.IsDir() {
+		if !d.IsDir() {
 			count++
 		}
 		return nil
@@ -0,0 +1,129 @@
+package main
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+	"time"
+	"wechatDataBackup/pkg/utils"
+)
+
+func newBackupTestApp(t *testing.T) (*App, string) {
+	t.Helper()
+	prefix := t.TempDir()
+	a := &App{FLoader: NewFileLoader(prefix), defaultUser: "wxid_test"}
+	expPath := filepath.Join(prefix, "User", "wxid_test")
+	if err := os.MkdirAll(filepath.Join(expPath, "Msg"), os.ModePerm); err != nil {
+		t.Fatal(err)
+	}
+	return a, expPath
+}
+
+func writeBackupTestFile(t *testing.T, path, content string, modTime time.Time) {
+	t.Helper()
+	if err := os.WriteFile(path, []byte(content), 0644); err != nil {
+		t.Fatal(err)
+	}
+	if err := os.Chtimes(path, modTime, modTime); err != nil {
+		t.Fatal(err)
+	}
+}
+
+func TestBackupHistoryRoundTrip(t *testing.T) {
+	a, _ := newBackupTestApp(t)
+	history := map[string]NewDataRecord{
+		"b.db": {FilePath: "b.db", FileSize: 2, ModifyTime: 20, FileHash: "hash-b"},
+		"a.db": {FilePath: "a.db", FileSize: 1, ModifyTime: 10, FileHash: "hash-a"},
+	}
+	a.saveBackupHistory(history)
+
+	loaded := a.loadBackupHistory()
+	if len(loaded) != len(history) {
+		t.Fatalf("loaded %d records, want %d", len(loaded), len(history))
+	}
+	for path, record := range history {
+		if loaded[path] != record {
+			t.Errorf("record %s = %+v, want %+v", path, loaded[path], record)
+		}
+	}
+}
+
+func TestScanReusesHistoryHashOnlyWhenUnchanged(t *testing.T) {
+	a, expPath := newBackupTestApp(t)
+	dbPath := filepath.Join(expPath, "Msg", "MSG0.db")
+	modTime := time.Unix(1700000000, 0)
+	writeBackupTestFile(t, dbPath, "old", modTime)
+
+	history := map[string]NewDataRecord{
+		dbPath: {FilePath: dbPath, FileSize: 3, ModifyTime: modTime.Unix(), ModifyTimeNs: modTime.UnixNano(), FileHash: "cached"},
+	}
+	result := &IncrementalBackupResult{}
+	a.scanDirectoryForBackup(filepath.Join(expPath, "Msg"), "", "database", history, result)
+	if got := result.NewDataRecords[0].FileHash; got != "cached" {
+		t.Fatalf("unchanged file hash = %q, want cached hash", got)
+	}
+
+	// 大小不变、改写落在同一秒内，也必须重新计算哈希
+	writeBackupTestFile(t, dbPath, "new", modTime.Add(500*time.Millisecond))
+	result = &IncrementalBackupResult{}
+	a.scanDirectoryForBackup(filepath.Join(expPath, "Msg"), "", "database", history, result)
+	want, err := utils.CalculateFileHash(dbPath)
+	if err != nil {
+		t.Fatal(err)
+	}
+	if got := result.NewDataRecords[0].FileHash; got != want {
+		t.Fatalf("modified file hash = %q, want %q", got, want)
+	}
+}
+
+func TestBackupKeepsFilesRewrittenDuringExport(t *testing.T) {
+	a, expPath := newBackupTestApp(t)
+	backupRoot := t.TempDir()
+	dbPath := filepath.Join(expPath, "Msg", "MSG0.db")
+	modTime := time.Unix(1700000000, 0)
+	writeBackupTestFile(t, dbPath, "before export", modTime)
+
+	// 第一次备份：扫描之后导出改写了文件
+	result := a.scanExistingFiles(expPath, backupRoot)
+	writeBackupTestFile(t, dbPath, "after export", modTime.Add(time.Hour))
+	result = a.backupNewData(expPath, result)
+	if result.BackupFiles != 1 {
+		t.Fatalf("first backup copied %d files, want 1", result.BackupFiles)
+	}
+
+	saved := a.loadBackupHistory()[dbPath]
+	if saved.ModifyTime != modTime.Unix() || saved.FileSize != int64(len("before export")) {
+		t.Fatalf("history record %+v does not describe the scanned file", saved)
+	}
+
+	// 第二次备份：文件内容已不同于历史记录中的版本，必须再次备份
+	result = a.scanExistingFiles(expPath, backupRoot)
+	result = a.backupNewData(expPath, result)
+	if result.BackupFiles != 1 {
+		t.Fatalf("second backup copied %d files, want 1", result.BackupFiles)
+	}
+
+	// 第三次备份：文件未再变化，应跳过
+	result = a.scanExistingFiles(expPath, backupRoot)
+	result = a.backupNewData(expPath, result)
+	if result.BackupFiles != 0 {
+		t.Fatalf("third backup copied %d files, want 0", result.BackupFiles)
+	}
+
+	// 第四次备份：上次的备份副本已被删除，必须重新备份
+	if err := os.RemoveAll(backupRoot); err != nil {
+		t.Fatal(err)
+	}
+	result = a.scanExistingFiles(expPath, backupRoot)
+	result = a.backupNewData(expPath, result)
+	if result.BackupFiles != 1 {
+		t.Fatalf("backup after deleting backup root copied %d files, want 1", result.BackupFiles)
+	}
+
+	// 第五次备份：换了新的备份根目录，历史中的副本不在其下，必须重新备份
+	result = a.scanExistingFiles(expPath, t.TempDir())
+	result = a.backupNewData(expPath, result)
+	if result.BackupFiles != 1 {
+		t.Fatalf("backup to a new backup root copied %d files, want 1", result.BackupFiles)
+	}
+}
@@ -20,6 +20,48 @@ func init() {
 	log.SetFlags(log.Ldate | log.Lmicroseconds | log.Lshortfile)
 }
 
+// 日志写入队列，调用方只需入队，由后台goroutine统一写文件和终端。
+// 队列只在main退出时的defer中刷新；其他goroutine发生panic时进程会直接退出，
+// 队列中尚未写出的日志（最多asyncLogQueueSize条）会丢失。因此队列保持很小，
+// 只用来吸收短时的写入抖动，排查崩溃时需要的日志大部分已经落盘。
+type asyncLogWriter struct {
+	w    io.Writer
+	ch   chan []byte
+	done chan struct{}
+}
+
+const asyncLogQueueSize = 32
+
+func newAsyncLogWriter(w io.Writer) *asyncLogWriter {
+	aw := &asyncLogWriter{
+		w:    w,
+		ch:   make(chan []byte, asyncLogQueueSize),
+		done: make(chan struct{}),
+	}
+	go func() {
+		defer close(aw.done)
+		for p := range aw.ch {
+			aw.w.Write(p)
+		}
+	}()
+	return aw
+}
+
+func (aw *asyncLogWriter) Write(p []byte) (int, error) {
+	// log包会复用p的底层内存，入队前需要拷贝
+	buf := make([]byte, len(p))
+	copy(buf, p)
+	aw.ch <- buf
+	return len(p), nil
+}
+
+// Close 等待队列中的日志全部写出，调用前需先把log输出切换到其他Writer
+func (aw *asyncLogWriter) Close() error {
+	close(aw.ch)
+	<-aw.done
+	return nil
+}
+
 func main() {
 	logJack := &lumberjack.Logger{
 		Filename:   "./app.log",
@@ -31,8 +73,13 @@ func main() {
 	defer logJack.Close()
 
 	multiWriter := io.MultiWriter(logJack, os.Stdout)
+	logWriter := newAsyncLogWriter(multiWriter)
+	defer func() {
+		log.SetOutput(multiWriter)
+		logWriter.Close()
+	}()
 	// 设置日志输出目标为文件
-	log.SetOutput(multiWriter)
+	log.SetOutput(logWriter)
 	log.Println("====================== wechatDataBackup ======================")
 	// Create an instance of the app structure
 	app := NewApp()
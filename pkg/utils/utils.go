@@ -13,6 +13,7 @@ import (
 	"path/filepath"
 	"regexp"
 	"strings"
+	"sync"
 
 	"github.com/pkg/browser"
 	"github.com/shirou/gopsutil/v3/disk"
@@ -20,6 +21,20 @@ import (
 	"golang.org/x/sys/windows/registry"
 )
 
+// 读取文件时每次读取的字节数
+const fileBufferSize = 1 << 20
+
+// 复用读文件缓冲区，避免每个文件都分配一次。
+// 使用时需把*os.File包装成只有io.Reader/io.Writer的结构体再交给io.CopyBuffer：
+// 否则io.CopyBuffer会改走File.ReadFrom（Windows下为32KB缓冲的通用实现），
+// 用Go 1.22及以上工具链构建时还会改走File.WriteTo，传入的缓冲区都会被忽略
+var fileBufferPool = sync.Pool{
+	New: func() interface{} {
+		buf := make([]byte, fileBufferSize)
+		return &buf
+	},
+}
+
 type PathStat struct {
 	Path        string  `json:"path"`
 	Total       uint64  `json:"total"`
@@ -148,7 +163,9 @@ func CopyFile(src, dst string) (int64, error) {
 	}
 	defer destFile.Close()
 
-	bytesWritten, err := io.Copy(destFile, sourceFile)
+	bufPtr := fileBufferPool.Get().(*[]byte)
+	defer fileBufferPool.Put(bufPtr)
+	bytesWritten, err := io.CopyBuffer(struct{ io.Writer }{destFile}, struct{ io.Reader }{sourceFile}, *bufPtr)
 	if err != nil {
 		return bytesWritten, err
 	}
@@ -245,7 +262,9 @@ func CalculateFileHash(filePath string) (string, error) {
 	defer file.Close()
 
 	hash := sha256.New()
-	if _, err := io.Copy(hash, file); err != nil {
+	bufPtr := fileBufferPool.Get().(*[]byte)
+	defer fileBufferPool.Put(bufPtr)
+	if _, err := io.CopyBuffer(hash, struct{ io.Reader }{file}, *bufPtr); err != nil {
 		return "", err
 	}
 